@@ -5,6 +5,7 @@ Implements the core functionality for a customer support AI agent.
 
 import asyncio
 import json
+from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
@@ -17,6 +18,31 @@ from agent.skills.customer_identification import CustomerIdentification
 from agent.hf_client import QwenClient
 
 
+@dataclass(slots=True)
+class QueryResult:
+    """
+    Result of handling one customer query.
+
+    Slots-based so field access is a fixed-offset attribute load instead of
+    a per-key dict hash lookup; ``__getitem__``/``__contains__`` keep the
+    historical dict-style access (``result['response']``) working.
+    """
+    response: str
+    sentiment: float
+    should_escalate: bool
+    conversation_id: Optional[str]
+    escalation_reason: Optional[str]
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return hasattr(self, key)
+
+
 class CustomerSuccessAgent:
     def __init__(self, hf_token: Optional[str] = None, db_client=None):
         """
@@ -41,7 +67,7 @@ class CustomerSuccessAgent:
         # Initialize database client
         self.db_client = db_client
     
-    async def handle_query(self, message: str, channel: str, customer_id: str, conversation_id: str = None) -> Dict[str, Any]:
+    async def handle_query(self, message: str, channel: str, customer_id: str, conversation_id: str = None) -> QueryResult:
         """
         Main method to handle a customer query.
         
@@ -50,9 +76,9 @@ class CustomerSuccessAgent:
             channel: Communication channel ('email', 'whatsapp', 'web_form')
             customer_id: Customer identifier
             conversation_id: Existing conversation ID (optional, creates new if not provided)
-            
+
         Returns:
-            Dictionary with response, sentiment, escalation info
+            QueryResult with response, sentiment, escalation info
         """
         # Step 0: Create conversation in DB if available and no conversation_id provided
         if conversation_id is None and self.db_client:
@@ -146,14 +172,39 @@ Provide a helpful, accurate answer based on the documentation."""
             await self.store_message(conversation_id, 'agent', adapted_response['adapted_response'])
         
         # Step 10: Return complete response
-        return {
-            'response': adapted_response['adapted_response'],
-            'sentiment': sentiment_result['sentiment_score'],
-            'should_escalate': escalation_result['should_escalate'],
-            'conversation_id': conversation_id,  # Return conversation ID for follow-ups
-            'escalation_reason': escalation_result['reasons'][0] if escalation_result['reasons'] else None
-        }
+        return QueryResult(
+            response=adapted_response['adapted_response'],
+            sentiment=sentiment_result['sentiment_score'],
+            should_escalate=escalation_result['should_escalate'],
+            conversation_id=conversation_id,  # Return conversation ID for follow-ups
+            escalation_reason=escalation_result['reasons'][0] if escalation_result['reasons'] else None
+        )
     
+    async def handle_query_batch(self, messages: List[str], channel: str,
+                                 customer_id: str) -> List[QueryResult]:
+        """
+        Handle several independent customer queries in one call.
+
+        Sentiment for all messages is scored in one batched pass (priming
+        the analyzer cache), then each message runs through the regular
+        pipeline concurrently.
+
+        Args:
+            messages: Customer messages to handle
+            channel: Communication channel ('email', 'whatsapp', 'web_form')
+            customer_id: Customer identifier
+
+        Returns:
+            List of QueryResult objects, one per message
+        """
+        # One batched sentiment pass; per-message handling below hits the cache
+        self.sentiment_analysis.detect_sentiment_batch(messages)
+
+        return list(await asyncio.gather(*(
+            self.handle_query(message, channel, customer_id)
+            for message in messages
+        )))
+
     async def create_conversation(self, customer_id: str, channel: str):
         """
         Create a new conversation record in the database.
@@ -293,6 +344,19 @@ Provide a helpful, accurate answer based on the documentation."""
         """
         result = self.sentiment_analysis.detect_sentiment(message)
         return result['sentiment_score']
+
+    def detect_sentiment_batch(self, messages: List[str]) -> List[float]:
+        """
+        Detect sentiment for several customer messages in one call.
+
+        Args:
+            messages: Customer messages to analyze
+
+        Returns:
+            List of sentiment scores, one per message, each from -1 to 1
+        """
+        results = self.sentiment_analysis.detect_sentiment_batch(messages)
+        return [result['sentiment_score'] for result in results]
     
     def should_escalate(self, message: str, sentiment: float) -> tuple[bool, Optional[str]]:
         """
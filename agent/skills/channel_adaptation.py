@@ -3,6 +3,7 @@ Channel Adaptation Skill
 Adapts response tone, length, and format based on communication channel.
 """
 
+from collections import OrderedDict
 from typing import Dict, Any, Optional
 
 
@@ -39,49 +40,78 @@ class ChannelAdaptation:
             'voice': ''  # No closing needed for voice as it's usually verbal
         }
 
+        # Precompute the (prefix, suffix) wrapping per channel once so each
+        # call is a single f-string join instead of template assembly.
+        # Voice and unrecognized channels pass through unchanged.
+        self._wrappers = {
+            'email': (f"{self.greetings['email']}\n\n", f"\n\n{self.closings['email']}"),
+            'whatsapp': (f"{self.greetings['whatsapp']} ", f" {self.closings['whatsapp']}"),
+            'web_form': (f"{self.greetings['web_form']}\n\n", f"\n\n{self.closings['web_form']}"),
+            'live_chat': (f"{self.greetings['live_chat']} ", f" {self.closings['live_chat']}"),
+        }
+
+        # Truncation markers appended when a channel limit is enforced;
+        # output ending in one was already formatted (the closing got
+        # cut off) and must not be wrapped again on re-entry.
+        self._truncation_markers = {
+            'whatsapp': "... (continued)",
+            'web_form': "...",
+        }
+
+        # Memoize (channel, response) -> formatted text. Canned responses and
+        # templates repeat across conversations, so re-rendering the same pair
+        # becomes a dict hit. LRU-capped to bound memory.
+        self._format_cache = OrderedDict()
+        self._format_cache_size = 1024
+
     def format_for_channel(self, response: str, channel: str) -> str:
         """
         Format the response appropriately for the given channel.
-        
+
+        Idempotent: a response already wrapped for the channel is returned
+        unchanged, and repeated (response, channel) pairs come from a
+        bounded memo cache.
+
         Args:
             response: Original response text
             channel: Communication channel ('email', 'whatsapp', 'live_chat', 'voice', 'web_form')
-            
+
         Returns:
             Formatted response for the specific channel
         """
         # Normalize channel name
         channel = channel.lower()
-        
-        # Apply channel-specific formatting
-        if channel == 'email':
-            # Formal email format
-            formatted_response = f"{self.greetings.get(channel, '')}\n\n{response}\n\n{self.closings.get(channel, '')}"
-        elif channel == 'whatsapp':
-            # Casual WhatsApp format, shorter
-            formatted_response = f"{self.greetings.get(channel, '')} {response} {self.closings.get(channel, '')}"
-            # Ensure it stays under the character limit
-            if len(formatted_response) > self.char_limits.get(channel, 300):
-                # Truncate and add indicator
-                formatted_response = formatted_response[:self.char_limits[channel]-10] + "... (continued)"
-        elif channel == 'web_form':
-            # Semi-formal format for web form responses
-            formatted_response = f"{self.greetings.get(channel, '')}\n\n{response}\n\n{self.closings.get(channel, '')}"
-            # Ensure it's within reasonable length
-            if len(formatted_response) > self.char_limits.get(channel, 500):
-                # Truncate to fit
-                formatted_response = formatted_response[:self.char_limits[channel]-10] + "..."
-        elif channel in ['live_chat', 'voice']:
-            # Casual format for live chat or voice
-            if channel == 'live_chat':
-                formatted_response = f"{self.greetings.get(channel, '')} {response} {self.closings.get(channel, '')}"
-            else:
-                # For voice, just return the response as-is (no formatting needed)
-                formatted_response = response
-        else:
-            # Default: return as-is if channel not recognized
+
+        cache_key = (channel, response)
+        cached = self._format_cache.get(cache_key)
+        if cached is not None:
+            self._format_cache.move_to_end(cache_key)
+            return cached
+
+        wrapper = self._wrappers.get(channel)
+        if wrapper is None:
+            # Voice or unrecognized channel: return as-is (no formatting needed)
             formatted_response = response
-        
+        else:
+            prefix, suffix = wrapper
+            marker = self._truncation_markers.get(channel)
+            if response.startswith(prefix) and (
+                    response.endswith(suffix)
+                    or (marker is not None and response.endswith(marker))):
+                # Already formatted for this channel (possibly truncated,
+                # which cuts off the closing); don't wrap twice
+                formatted_response = response
+            else:
+                formatted_response = f"{prefix}{response}{suffix}"
+                # Enforce channel character limits with a truncation indicator
+                if marker is not None and len(formatted_response) > self.char_limits[channel]:
+                    formatted_response = formatted_response[:self.char_limits[channel]-10] + marker
+
+        # Store in cache, evicting the least recently used entry if full
+        self._format_cache[cache_key] = formatted_response
+        if len(self._format_cache) > self._format_cache_size:
+            self._format_cache.popitem(last=False)
+
         return formatted_response
 
     def adapt_response(
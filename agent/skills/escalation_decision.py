@@ -3,6 +3,7 @@ Escalation Decision Skill
 Decides whether the issue should be handled by AI or escalated to a human agent.
 """
 
+import re
 from typing import Dict, List, Any, Optional
 
 
@@ -13,16 +14,33 @@ class EscalationDecision:
         """
         # Keywords that trigger escalation
         self.escalation_keywords = {
-            'pricing', 'price', 'cost', 'charge', 'refund', 'cancel', 
+            'pricing', 'price', 'cost', 'charge', 'refund', 'cancel',
             'billing', 'payment', 'invoice', 'quote', 'quote', 'enterprise',
             'plan', 'subscription', 'lawyer', 'legal', 'complaint',
             'manager', 'supervisor', 'ceo', 'executive', 'lawsuit', 'sue',
             'contract', 'agreement', 'violation', 'breach', 'dispute'
         }
-        
+
+        # Phrases indicating the customer wants a human agent
+        self.human_request_phrases = [
+            'speak to a human', 'human agent', 'talk to someone',
+            'real person', 'customer service rep', 'agent',
+            'can i talk', 'i want to speak', 'put me through to'
+        ]
+
+        # Precompiled alternations: one linear scan of the message replaces
+        # a substring check per keyword/phrase. Longest-first ordering so
+        # e.g. 'lawsuit' wins over its substring 'sue'.
+        self._keyword_pattern = re.compile('|'.join(
+            sorted(map(re.escape, self.escalation_keywords), key=len, reverse=True)
+        ))
+        self._human_request_pattern = re.compile('|'.join(
+            sorted(map(re.escape, self.human_request_phrases), key=len, reverse=True)
+        ))
+
         # Negative sentiment threshold for escalation
         self.negative_sentiment_threshold = -0.3
-        
+
         # Maximum resolution attempts before escalation
         self.max_resolution_attempts = 3
 
@@ -50,11 +68,10 @@ class EscalationDecision:
         reasons = []
         urgency_level = "low"
         
-        # Check for escalation keywords in the current message
+        # Check for escalation keywords in one scan of the current message
         message_lower = customer_message.lower()
-        found_keywords = [keyword for keyword in self.escalation_keywords 
-                         if keyword in message_lower]
-        
+        found_keywords = list(dict.fromkeys(self._keyword_pattern.findall(message_lower)))
+
         if found_keywords:
             reasons.extend(found_keywords)
             # Set urgency based on keyword type
@@ -75,18 +92,10 @@ class EscalationDecision:
                 urgency_level = "medium"
         
         # Check if customer explicitly requested human assistance
-        human_request_phrases = [
-            'speak to a human', 'human agent', 'talk to someone', 
-            'real person', 'customer service rep', 'agent', 
-            'can i talk', 'i want to speak', 'put me through to'
-        ]
-        
-        for phrase in human_request_phrases:
-            if phrase in message_lower:
-                reasons.append("customer_requested_human")
-                if urgency_level != "critical":
-                    urgency_level = "high"
-                break
+        if self._human_request_pattern.search(message_lower):
+            reasons.append("customer_requested_human")
+            if urgency_level != "critical":
+                urgency_level = "high"
         
         # Check resolution attempts
         if resolution_attempts >= self.max_resolution_attempts:
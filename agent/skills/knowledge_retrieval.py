@@ -5,20 +5,39 @@ Fetches correct information from FAQs, documents, or database based on user quer
 
 import json
 import os
+import time
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional
 from pathlib import Path
 
 
 class KnowledgeRetrieval:
-    def __init__(self, knowledge_base_path: str = "context/product-docs.md"):
+    def __init__(self, knowledge_base_path: str = "context/product-docs.md",
+                 cache_size: int = 128, cache_ttl: float = 300.0):
         """
         Initialize the knowledge retrieval system with a knowledge base.
-        
+
         Args:
             knowledge_base_path: Path to the knowledge base file
+            cache_size: Maximum number of cached query results (LRU eviction)
+            cache_ttl: Seconds a cached result stays valid
         """
         self.knowledge_base_path = knowledge_base_path
         self.knowledge_base = self._load_knowledge_base()
+
+        # Pre-normalize the searchable text once (parallel arrays aligned
+        # with knowledge_base) so each query scores against ready-made
+        # lowercase strings instead of re-lowercasing every entry per call.
+        self._titles_lower = [entry['title'].lower() for entry in self.knowledge_base]
+        self._contents_lower = [entry['content'].lower() for entry in self.knowledge_base]
+
+        # LRU cache of recent query results. Support conversations repeat the
+        # same handful of queries ("password reset", "add team members"), so
+        # repeated lookups return the cached result instead of re-scoring the
+        # whole knowledge base.
+        self._query_cache = OrderedDict()
+        self._cache_size = cache_size
+        self._cache_ttl = cache_ttl
     
     def _load_knowledge_base(self) -> List[Dict[str, Any]]:
         """
@@ -108,26 +127,24 @@ class KnowledgeRetrieval:
             List of relevant knowledge base entries
         """
         # Simple keyword matching algorithm
-        query_lower = query.lower()
+        query_words = query.lower().split()
+        query_length = len(query_words)
         results = []
-        
-        for entry in self.knowledge_base:
-            # Calculate relevance score based on keyword matching
-            title_lower = entry['title'].lower()
-            content_lower = entry['content'].lower()
-            
-            # Count matches in title and content
-            title_matches = len([word for word in query_lower.split() if word in title_lower])
-            content_matches = len([word for word in query_lower.split() if word in content_lower])
-            
+
+        for entry, title_lower, content_lower in zip(
+                self.knowledge_base, self._titles_lower, self._contents_lower):
+            # Count matches in the pre-lowercased title and content
+            title_matches = sum(1 for word in query_words if word in title_lower)
+            content_matches = sum(1 for word in query_words if word in content_lower)
+
             # Calculate a simple relevance score
             # Title matches are weighted more heavily than content matches
             relevance_score = (title_matches * 0.7) + (content_matches * 0.3)
-            
+
             # Normalize the score (simple normalization based on query length)
-            if len(query_lower.split()) > 0:
-                relevance_score = relevance_score / len(query_lower.split())
-            
+            if query_length > 0:
+                relevance_score = relevance_score / query_length
+
             # Apply a simple threshold to filter out very low matches
             if relevance_score > 0:
                 results.append({
@@ -162,15 +179,36 @@ class KnowledgeRetrieval:
         search_query = query
         if context:
             search_query = f"{query} {context}"
-        
+
+        # Check the LRU cache before re-scoring the knowledge base
+        cache_key = (search_query.lower(), max_results)
+        cached = self._query_cache.get(cache_key)
+        if cached is not None:
+            cached_at, cached_result = cached
+            if time.monotonic() - cached_at < self._cache_ttl:
+                self._query_cache.move_to_end(cache_key)
+                # Shallow copy so callers mutating the result (or its
+                # results list) don't poison the cached entry
+                return {**cached_result, 'results': list(cached_result['results'])}
+            del self._query_cache[cache_key]
+
         # Perform the search
         results = self.search_knowledge_base(search_query, max_results=max_results)
-        
-        return {
+
+        result = {
             'results': results,
             'query_understanding': search_query
         }
 
+        # Store in cache, evicting the least recently used entry if full
+        self._query_cache[cache_key] = (time.monotonic(), result)
+        if len(self._query_cache) > self._cache_size:
+            self._query_cache.popitem(last=False)
+
+        # Same defensive copy as the hit path — the caller never gets a
+        # reference into the cache
+        return {**result, 'results': list(results)}
+
 
 # Example usage
 if __name__ == "__main__":
@@ -3,9 +3,12 @@ Sentiment Analysis Skill
 Analyzes user message and classifies sentiment (positive, neutral, negative, angry).
 """
 
+import functools
 import re
 from typing import Dict, List, Optional
 
+import numpy as np
+
 
 class SentimentAnalysis:
     def __init__(self):
@@ -34,20 +37,32 @@ class SentimentAnalysis:
         # Compile regex patterns for efficiency
         self.exclamation_pattern = re.compile(r'[!]{2,}')
         self.caps_pattern = re.compile(r'\b[A-Z]{3,}\b')
-        
-    def detect_sentiment(self, message: str, previous_messages: Optional[List[str]] = None, 
+
+        # Memoize analysis per message text. Scoring is deterministic for a
+        # given message, and support conversations repeat the same phrasings.
+        # The key keeps the original casing because CAPS are an intensity
+        # signal; only surrounding whitespace is stripped.
+        self._analyze_cached = functools.lru_cache(maxsize=4096)(self._analyze_message)
+
+    def detect_sentiment(self, message: str, previous_messages: Optional[List[str]] = None,
                         language: str = "en") -> Dict[str, float]:
         """
         Analyze the sentiment of a message.
-        
+
         Args:
             message: The customer message to analyze
             previous_messages: Recent conversation history for context
             language: Language of the message (default: "en")
-            
+
         Returns:
             Dictionary containing sentiment analysis results
         """
+        result = self._analyze_cached(message.strip())
+        # Copy the mutable parts so callers can't corrupt the cached entry
+        return {**result, 'emotional_indicators': list(result['emotional_indicators'])}
+
+    def _analyze_message(self, message: str) -> Dict[str, float]:
+        """Run the full word-list analysis for a single message."""
         # Normalize the message
         normalized_msg = message.lower().strip()
         
@@ -133,6 +148,51 @@ class SentimentAnalysis:
             'confidence': round(confidence, 3)
         }
 
+    def detect_sentiment_batch(self, messages: List[str],
+                               previous_messages: Optional[List[str]] = None,
+                               language: str = "en") -> List[Dict[str, float]]:
+        """
+        Analyze the sentiment of several messages in one call.
+
+        The word-list scorer processes each message independently; callers
+        that swap in a model-backed analyzer can run a single batched
+        forward pass here instead of one per message.
+
+        Args:
+            messages: Customer messages to analyze
+            previous_messages: Recent conversation history for context
+            language: Language of the messages (default: "en")
+
+        Returns:
+            List of sentiment analysis results, one per message
+        """
+        return [
+            self.detect_sentiment(message, previous_messages, language)
+            for message in messages
+        ]
+
+    def detect_sentiment_scores(self, messages: List[str]) -> np.ndarray:
+        """
+        Score several messages and return only the sentiment scores.
+
+        Fast path for callers (and tests) that need just the scalar score
+        per message: no per-sample result dict is materialized, and the
+        contiguous float32 array supports vectorized checks like
+        ``(scores < 0).all()``.
+
+        Args:
+            messages: Customer messages to analyze
+
+        Returns:
+            float32 ndarray of sentiment scores, one per message
+        """
+        return np.fromiter(
+            (self._analyze_cached(message.strip())['sentiment_score']
+             for message in messages),
+            dtype=np.float32,
+            count=len(messages)
+        )
+
 
 # Example usage
 if __name__ == "__main__":
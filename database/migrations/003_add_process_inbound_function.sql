@@ -0,0 +1,82 @@
+-- Migration: Add fused inbound-processing function
+-- Run this after the initial schema.sql
+--
+-- process_inbound resolves the customer, finds or creates the active
+-- conversation, and stores the inbound message inside the server in a
+-- single call — one network round-trip instead of three.
+
+CREATE OR REPLACE FUNCTION process_inbound(
+    p_channel VARCHAR,
+    p_email   VARCHAR,
+    p_phone   VARCHAR,
+    p_name    VARCHAR,
+    p_content TEXT,
+    p_meta    JSONB DEFAULT '{}'
+) RETURNS TABLE (customer_id UUID, conversation_id UUID, message_id UUID) AS $$
+DECLARE
+    v_customer     UUID;
+    v_conversation UUID;
+    v_message      UUID;
+BEGIN
+    -- 1. Resolve customer: email column, email identifier, then phone
+    -- (email columns are citext — see 006 — so matching is
+    -- case-insensitive and inserts keep the caller's original casing)
+    IF p_email IS NOT NULL THEN
+        SELECT c.id INTO v_customer
+        FROM customers c WHERE c.email = p_email;
+
+        IF v_customer IS NULL THEN
+            SELECT ci.customer_id INTO v_customer
+            FROM customer_identifiers ci
+            WHERE ci.identifier_type = 'email'
+              AND ci.identifier_value = p_email;
+        END IF;
+    END IF;
+
+    IF v_customer IS NULL AND p_phone IS NOT NULL THEN
+        SELECT ci.customer_id INTO v_customer
+        FROM customer_identifiers ci
+        WHERE ci.identifier_type = 'whatsapp'
+          AND ci.identifier_value = p_phone;
+    END IF;
+
+    IF v_customer IS NULL THEN
+        INSERT INTO customers (email, phone, name)
+        VALUES (p_email, p_phone, p_name)
+        RETURNING id INTO v_customer;
+
+        IF p_email IS NOT NULL THEN
+            INSERT INTO customer_identifiers (customer_id, identifier_type, identifier_value)
+            VALUES (v_customer, 'email', p_email)
+            ON CONFLICT (identifier_type, identifier_value) DO NOTHING;
+        END IF;
+        IF p_phone IS NOT NULL THEN
+            INSERT INTO customer_identifiers (customer_id, identifier_type, identifier_value)
+            VALUES (v_customer, 'whatsapp', p_phone)
+            ON CONFLICT (identifier_type, identifier_value) DO NOTHING;
+        END IF;
+    END IF;
+
+    -- 2. Active conversation within 24 hours, or a new one
+    SELECT v.id INTO v_conversation
+    FROM conversations v
+    WHERE v.customer_id = v_customer
+      AND v.status = 'active'
+      AND v.started_at > NOW() - INTERVAL '24 hours'
+    ORDER BY v.started_at DESC
+    LIMIT 1;
+
+    IF v_conversation IS NULL THEN
+        INSERT INTO conversations (customer_id, initial_channel, status)
+        VALUES (v_customer, p_channel, 'active')
+        RETURNING id INTO v_conversation;
+    END IF;
+
+    -- 3. Store the inbound message
+    INSERT INTO messages (conversation_id, channel, direction, role, content, metadata)
+    VALUES (v_conversation, p_channel, 'inbound', 'customer', p_content, p_meta)
+    RETURNING id INTO v_message;
+
+    RETURN QUERY SELECT v_customer, v_conversation, v_message;
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,17 @@
+-- Migration: Index the two per-message hot queries
+-- Run this after the initial schema.sql
+--
+-- Every inbound message runs an active-conversation lookup
+-- (customer_id + status + started_at window) and a history fetch
+-- (conversation_id ordered by created_at). These indexes turn both
+-- into ordered index scans with no sort node.
+--
+-- CONCURRENTLY avoids blocking writes on a live system; run each
+-- statement outside a transaction block.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_conv_active
+    ON conversations (customer_id, started_at DESC)
+    WHERE status = 'active';
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_messages_conv_time
+    ON messages (conversation_id, created_at);
@@ -0,0 +1,16 @@
+-- Migration: Hourly rollup for agent metrics
+-- Run this after the initial schema.sql
+--
+-- The metrics collector upserts additive totals into one row per
+-- (hour, channel, metric), so the daily report sums at most
+-- 24 x channels x metrics rows instead of scanning every raw
+-- agent_metrics row from the last 24 hours.
+
+CREATE TABLE IF NOT EXISTS agent_metrics_hourly (
+    hour        TIMESTAMP WITH TIME ZONE NOT NULL,
+    channel     VARCHAR(50) NOT NULL,
+    metric_name VARCHAR(100) NOT NULL,
+    total       DECIMAL(14,4) NOT NULL DEFAULT 0,
+    count       BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (hour, channel, metric_name)
+);
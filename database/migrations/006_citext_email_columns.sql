@@ -0,0 +1,11 @@
+-- Migration: Case-insensitive identity columns
+-- Run this after the initial schema.sql
+--
+-- citext matches case-insensitively while preserving the stored
+-- casing, so the workers no longer normalize emails with .lower()
+-- before every query and case-mismatch lookups cannot miss.
+
+CREATE EXTENSION IF NOT EXISTS "citext";
+
+ALTER TABLE customers ALTER COLUMN email TYPE CITEXT;
+ALTER TABLE customer_identifiers ALTER COLUMN identifier_value TYPE CITEXT;
@@ -35,6 +35,9 @@ class DatabaseManager:
             max_size=5,
             command_timeout=60,
             ssl="require",
+            # Room for every hot-path statement to stay prepared on each
+            # connection (default is 100; the workers reuse fixed SQL text)
+            statement_cache_size=200,
         )
     
     async def close(self):
@@ -4,11 +4,12 @@
 -- Enable extensions
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 CREATE EXTENSION IF NOT EXISTS "vector";
+CREATE EXTENSION IF NOT EXISTS "citext";
 
 -- 1. customers table
 CREATE TABLE customers (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    email VARCHAR(255) UNIQUE,
+    email CITEXT UNIQUE,  -- case-insensitive match, original casing kept
     phone VARCHAR(50),
     name VARCHAR(255),
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
@@ -24,7 +25,7 @@ CREATE TABLE customer_identifiers (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     customer_id UUID NOT NULL REFERENCES customers(id) ON DELETE CASCADE,
     identifier_type VARCHAR(50) NOT NULL CHECK (identifier_type IN ('email', 'phone', 'whatsapp')),
-    identifier_value VARCHAR(255) NOT NULL,
+    identifier_value CITEXT NOT NULL,
     verified BOOLEAN DEFAULT FALSE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     UNIQUE (identifier_type, identifier_value)
@@ -53,6 +54,9 @@ CREATE INDEX idx_conversations_customer_id ON conversations(customer_id);
 CREATE INDEX idx_conversations_status ON conversations(status);
 CREATE INDEX idx_conversations_initial_channel ON conversations(initial_channel);
 CREATE INDEX idx_conversations_started_at ON conversations(started_at);
+-- Partial index backing the per-message active-conversation lookup
+-- (kept in sync with database/migrations/004_add_hot_query_indexes.sql)
+CREATE INDEX idx_conv_active ON conversations(customer_id, started_at DESC) WHERE status = 'active';
 
 -- 4. messages table
 CREATE TABLE messages (
@@ -75,6 +79,9 @@ CREATE TABLE messages (
 CREATE INDEX idx_messages_conversation_id ON messages(conversation_id);
 CREATE INDEX idx_messages_channel ON messages(channel);
 CREATE INDEX idx_messages_created_at ON messages(created_at);
+-- Composite index backing the ordered history fetch
+-- (kept in sync with database/migrations/004_add_hot_query_indexes.sql)
+CREATE INDEX idx_messages_conv_time ON messages(conversation_id, created_at);
 
 -- 5. tickets table
 CREATE TABLE tickets (
@@ -138,6 +145,17 @@ CREATE INDEX idx_agent_metrics_name ON agent_metrics(metric_name);
 CREATE INDEX idx_agent_metrics_recorded_at ON agent_metrics(recorded_at);
 CREATE INDEX idx_agent_metrics_channel ON agent_metrics(channel);
 
+-- 8b. agent_metrics_hourly rollup (one row per hour/channel/metric;
+-- kept in sync with database/migrations/005_add_agent_metrics_hourly.sql)
+CREATE TABLE agent_metrics_hourly (
+    hour        TIMESTAMP WITH TIME ZONE NOT NULL,
+    channel     VARCHAR(50) NOT NULL,
+    metric_name VARCHAR(100) NOT NULL,
+    total       DECIMAL(14,4) NOT NULL DEFAULT 0,
+    count       BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (hour, channel, metric_name)
+);
+
 -- 9. users table (portal authentication)
 CREATE TABLE IF NOT EXISTS users (
     id            UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -154,4 +172,84 @@ CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 INSERT INTO channel_configs (channel, enabled, config, response_template, max_response_length) VALUES
 ('email', true, '{"smtp_host": "smtp.gmail.com", "smtp_port": 587}', 'Dear {{customer_name}},\n\n{{response_content}}\n\nBest regards,\nTechCorp Support', 1000),
 ('whatsapp', true, '{"api_key": "", "api_secret": ""}', '{{response_content}}', 300),
-('web_form', true, '{}', '{{response_content}}', 500);
\ No newline at end of file
+('web_form', true, '{}', '{{response_content}}', 500);
+
+-- Fused inbound-processing path: resolve customer, find or create the
+-- active conversation, and store the inbound message in one server-side
+-- call (one network round-trip instead of three).
+-- Kept in sync with database/migrations/003_add_process_inbound_function.sql
+CREATE OR REPLACE FUNCTION process_inbound(
+    p_channel VARCHAR,
+    p_email   VARCHAR,
+    p_phone   VARCHAR,
+    p_name    VARCHAR,
+    p_content TEXT,
+    p_meta    JSONB DEFAULT '{}'
+) RETURNS TABLE (customer_id UUID, conversation_id UUID, message_id UUID) AS $$
+DECLARE
+    v_customer     UUID;
+    v_conversation UUID;
+    v_message      UUID;
+BEGIN
+    -- 1. Resolve customer: email column, email identifier, then phone
+    -- (email columns are citext, so matching is case-insensitive and
+    -- inserts keep the caller's original casing)
+    IF p_email IS NOT NULL THEN
+        SELECT c.id INTO v_customer
+        FROM customers c WHERE c.email = p_email;
+
+        IF v_customer IS NULL THEN
+            SELECT ci.customer_id INTO v_customer
+            FROM customer_identifiers ci
+            WHERE ci.identifier_type = 'email'
+              AND ci.identifier_value = p_email;
+        END IF;
+    END IF;
+
+    IF v_customer IS NULL AND p_phone IS NOT NULL THEN
+        SELECT ci.customer_id INTO v_customer
+        FROM customer_identifiers ci
+        WHERE ci.identifier_type = 'whatsapp'
+          AND ci.identifier_value = p_phone;
+    END IF;
+
+    IF v_customer IS NULL THEN
+        INSERT INTO customers (email, phone, name)
+        VALUES (p_email, p_phone, p_name)
+        RETURNING id INTO v_customer;
+
+        IF p_email IS NOT NULL THEN
+            INSERT INTO customer_identifiers (customer_id, identifier_type, identifier_value)
+            VALUES (v_customer, 'email', p_email)
+            ON CONFLICT (identifier_type, identifier_value) DO NOTHING;
+        END IF;
+        IF p_phone IS NOT NULL THEN
+            INSERT INTO customer_identifiers (customer_id, identifier_type, identifier_value)
+            VALUES (v_customer, 'whatsapp', p_phone)
+            ON CONFLICT (identifier_type, identifier_value) DO NOTHING;
+        END IF;
+    END IF;
+
+    -- 2. Active conversation within 24 hours, or a new one
+    SELECT v.id INTO v_conversation
+    FROM conversations v
+    WHERE v.customer_id = v_customer
+      AND v.status = 'active'
+      AND v.started_at > NOW() - INTERVAL '24 hours'
+    ORDER BY v.started_at DESC
+    LIMIT 1;
+
+    IF v_conversation IS NULL THEN
+        INSERT INTO conversations (customer_id, initial_channel, status)
+        VALUES (v_customer, p_channel, 'active')
+        RETURNING id INTO v_conversation;
+    END IF;
+
+    -- 3. Store the inbound message
+    INSERT INTO messages (conversation_id, channel, direction, role, content, metadata)
+    VALUES (v_conversation, p_channel, 'inbound', 'customer', p_content, p_meta)
+    RETURNING id INTO v_message;
+
+    RETURN QUERY SELECT v_customer, v_conversation, v_message;
+END;
+$$ LANGUAGE plpgsql;
@@ -137,7 +137,7 @@ class RedisQueue:
         group: str,
         consumer: str,
         callback: Callable,
-        count: int = 10,
+        count: int = 32,
         block: int = 5000
     ):
         """
@@ -572,12 +572,13 @@ class RedisConsumer:
         """
         while self.running:
             try:
-                # Read messages
+                # Blocking read: wakes the instant a message lands instead
+                # of polling, and drains bursts in batches of 32
                 messages = await self.client.xreadgroup(
                     groupname=group,
                     consumername=consumer,
                     streams={stream: '>'},
-                    count=10,
+                    count=32,
                     block=5000  # 5 seconds
                 )
                 
@@ -7,8 +7,8 @@ Provides producers and consumers for all FTE message topics.
 """
 
 import asyncio
-import json
 import logging
+import orjson
 import os
 from datetime import datetime
 from typing import Callable, Awaitable
@@ -66,7 +66,7 @@ class FTEKafkaProducer:
         """Start the Kafka producer."""
         self._producer = AIOKafkaProducer(
             bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
-            value_serializer=lambda v: json.dumps(v, default=str).encode("utf-8"),
+            value_serializer=lambda v: orjson.dumps(v, default=str),
             acks="all",
             enable_idempotence=True,
             max_batch_size=16384,
@@ -127,6 +127,9 @@ class FTEKafkaConsumer:
         await consumer.consume(my_handler_func)
     """
 
+    # Seconds without a message before a partial offset batch is committed
+    IDLE_COMMIT_TIMEOUT_S = 5.0
+
     def __init__(self, topics: list[str], group_id: str):
         self.topics = topics
         self.group_id = group_id
@@ -138,7 +141,7 @@ class FTEKafkaConsumer:
             *self.topics,
             bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS,
             group_id=self.group_id,
-            value_deserializer=lambda v: json.loads(v.decode("utf-8")),
+            value_deserializer=orjson.loads,
             auto_offset_reset="earliest",
             enable_auto_commit=False,  # Manual commit for reliability
             max_poll_records=10,
@@ -158,45 +161,79 @@ class FTEKafkaConsumer:
         self,
         handler: Callable[[str, dict], Awaitable[None]],
         error_topic: str = None,
+        commit_every: int = 1,
     ):
         """
         Consume messages and pass to handler function.
 
         The handler receives (topic_name, message_dict).
         Failed messages are published to the DLQ if error_topic is set.
+
+        commit_every > 1 amortizes the offset-commit round-trip over a
+        batch of messages (at-least-once: a crash may redeliver up to
+        commit_every - 1 already-handled messages). Outstanding offsets
+        are committed when the topic goes idle and again when the loop
+        exits, so a graceful stop never redelivers handled messages.
         """
         if not self._consumer:
             raise RuntimeError("Consumer not started. Call await consumer.start() first.")
 
         logger.info(f"Starting to consume from: {self.topics}")
 
-        async for msg in self._consumer:
-            try:
-                logger.debug(
-                    f"Received message from {msg.topic} "
-                    f"[partition={msg.partition}, offset={msg.offset}]"
-                )
-                await handler(msg.topic, msg.value)
-                await self._consumer.commit()
-
-            except Exception as e:
-                logger.error(
-                    f"Handler failed for message from {msg.topic}: {e}",
-                    exc_info=True,
-                )
-                if error_topic:
-                    # Publish to DLQ for manual review
-                    dlq_event = {
-                        "original_topic": msg.topic,
-                        "original_message": msg.value,
-                        "error": str(e),
-                        "failed_at": datetime.utcnow().isoformat(),
-                    }
-                    logger.warning(f"Publishing failed message to DLQ: {error_topic}")
-                    # Note: DLQ publish happens outside the consumer, caller handles it
-
-                # Commit offset to avoid infinite retry on poison messages
-                await self._consumer.commit()
+        uncommitted = 0
+        try:
+            while True:
+                try:
+                    msg = await asyncio.wait_for(
+                        self._consumer.getone(), timeout=self.IDLE_COMMIT_TIMEOUT_S
+                    )
+                except asyncio.TimeoutError:
+                    # Topic is idle: flush the partial batch rather than
+                    # sitting on handled-but-uncommitted offsets
+                    if uncommitted:
+                        await self._consumer.commit()
+                        uncommitted = 0
+                    continue
+
+                try:
+                    logger.debug(
+                        f"Received message from {msg.topic} "
+                        f"[partition={msg.partition}, offset={msg.offset}]"
+                    )
+                    await handler(msg.topic, msg.value)
+                    uncommitted += 1
+                    if uncommitted >= commit_every:
+                        await self._consumer.commit()
+                        uncommitted = 0
+
+                except Exception as e:
+                    logger.error(
+                        f"Handler failed for message from {msg.topic}: {e}",
+                        exc_info=True,
+                    )
+                    if error_topic:
+                        # Publish to DLQ for manual review
+                        dlq_event = {
+                            "original_topic": msg.topic,
+                            "original_message": msg.value,
+                            "error": str(e),
+                            "failed_at": datetime.utcnow().isoformat(),
+                        }
+                        logger.warning(f"Publishing failed message to DLQ: {error_topic}")
+                        # Note: DLQ publish happens outside the consumer, caller handles it
+
+                    # Commit offset (and any batched ones) to avoid infinite
+                    # retry on poison messages
+                    await self._consumer.commit()
+                    uncommitted = 0
+        finally:
+            # Flush whatever is left of the batch on the way out so a
+            # graceful shutdown doesn't leave handled offsets uncommitted
+            if uncommitted:
+                try:
+                    await self._consumer.commit()
+                except Exception as e:
+                    logger.warning(f"Final offset commit failed: {e}")
 
     async def __aenter__(self):
         await self.start()
@@ -10,6 +10,8 @@ from datetime import datetime
 
 class TestEmailChannel:
     """Test email channel integration"""
+
+    pytestmark = pytest.mark.webhook
     
     @pytest.mark.asyncio
     async def test_gmail_webhook_endpoint(self, api_client, sample_email_message):
@@ -73,6 +75,8 @@ class TestEmailChannel:
 
 class TestWhatsAppChannel:
     """Test WhatsApp channel integration"""
+
+    pytestmark = pytest.mark.webhook
     
     @pytest.mark.asyncio
     async def test_whatsapp_webhook_endpoint(self, api_client, sample_whatsapp_message):
@@ -172,6 +172,17 @@ class _async_ctx:
 # 3. Web form submit — validation tests (no DB needed)
 # ══════════════════════════════════════════════════════════════════════════════
 
+# Base payload for the validation tests; each case mutates exactly one field.
+VALID_FORM_PAYLOAD = {
+    "name": "Alice",
+    "email": "alice@example.com",
+    "subject": "Question about billing",
+    "category": "billing",
+    "priority": "medium",
+    "message": "I have a billing question that I need help with.",
+}
+
+
 class TestWebFormSubmit:
 
     @pytest.fixture
@@ -190,29 +201,16 @@ class TestWebFormSubmit:
         assert res.status_code == 422
 
     @pytest.mark.asyncio
-    async def test_short_message_returns_422(self, client):
-        async with client as c:
-            res = await c.post("/api/support/submit", json={
-                "name": "Alice",
-                "email": "alice@example.com",
-                "subject": "Help me",
-                "category": "general",
-                "priority": "medium",
-                "message": "short",   # < 10 chars
-            })
-        assert res.status_code == 422
-
-    @pytest.mark.asyncio
-    async def test_invalid_email_returns_422(self, client):
+    @pytest.mark.parametrize("field,bad_value", [
+        ("name", "A"),                        # < 2 chars
+        ("email", "not-an-email"),
+        ("message", "short"),                 # < 10 chars
+        ("category", "nonexistent_category"),
+    ])
+    async def test_form_validation_rejects(self, client, field, bad_value):
+        payload = {**VALID_FORM_PAYLOAD, field: bad_value}
         async with client as c:
-            res = await c.post("/api/support/submit", json={
-                "name": "Bob",
-                "email": "not-an-email",
-                "subject": "Question about billing",
-                "category": "billing",
-                "priority": "low",
-                "message": "I have a billing question that I need help with.",
-            })
+            res = await c.post("/api/support/submit", json=payload)
         assert res.status_code == 422
 
     @pytest.mark.asyncio
@@ -237,19 +235,6 @@ class TestWebFormSubmit:
         assert "message" in data
         assert "estimated_response_time" in data
 
-    @pytest.mark.asyncio
-    async def test_invalid_category_returns_422(self, client):
-        async with client as c:
-            res = await c.post("/api/support/submit", json={
-                "name": "Dave",
-                "email": "dave@example.com",
-                "subject": "Something weird",
-                "category": "nonexistent_category",
-                "priority": "low",
-                "message": "This is a long enough message to pass validation.",
-            })
-        assert res.status_code == 422
-
 
 # ══════════════════════════════════════════════════════════════════════════════
 # 4. Auth endpoints — error cases without DB
@@ -7,7 +7,6 @@ import asyncio
 import pytest
 import tempfile
 import os
-from unittest.mock import Mock, patch, MagicMock, AsyncMock
 from agent.agent_prototype import CustomerSuccessAgent
 from agent.skills.knowledge_retrieval import KnowledgeRetrieval
 from agent.skills.sentiment_analysis import SentimentAnalysis
@@ -16,92 +15,133 @@ from agent.skills.channel_adaptation import ChannelAdaptation
 from agent.skills.customer_identification import CustomerIdentification
 
 
+# Canned knowledge base payloads and responses shared by the flow tests.
+CANNED_KB = {
+    'results': [{
+        'id': 1,
+        'title': 'Adding Team Members',
+        'content': 'To add team members, go to your project settings and click "Invite Members". Enter their email addresses and select their permission level.',
+        'confidence': 0.9,
+        'source': 'product-docs.md'
+    }],
+    'query_understanding': 'adding team members'
+}
+CANNED_RESPONSE = "To add team members, go to your project settings and click 'Invite Members'. Enter their email addresses and select their permission level."
+
+FOLLOW_UP_KB = {
+    'results': [{
+        'id': 1,
+        'title': 'Team Size Limits',
+        'content': 'Free accounts have a limit of 5 team members. Pro accounts support up to 25 members, and Enterprise accounts have unlimited members.',
+        'confidence': 0.95,
+        'source': 'product-docs.md'
+    }],
+    'query_understanding': 'team size limits'
+}
+FOLLOW_UP_RESPONSE = "Free accounts have a limit of 5 team members. Pro accounts support up to 25 members, and Enterprise accounts have unlimited members."
+
+
 class MockDB:
-    """Mock database for testing purposes."""
-    
+    """Mock database for testing purposes.
+
+    Storage is structure-of-arrays (parallel lists per field) instead of a
+    dict-of-dicts, and the async API is a thin shim over sync helpers --
+    these methods do no real I/O, so there is nothing to await. The
+    ``conversations``/``messages`` dict views exist only for assertions.
+    """
+
     def __init__(self):
-        self.conversations = {}
-        self.messages = {}
-    
+        self._conv_ids = []
+        self._customer_ids = []
+        self._channels = []
+        self._msg_senders = {}
+        self._msg_contents = {}
+
+    # Sync helpers doing the actual work
+    def _create_conversation(self, customer_id, channel):
+        conversation_id = f"conv_{len(self._conv_ids) + 1}"
+        self._conv_ids.append(conversation_id)
+        self._customer_ids.append(customer_id)
+        self._channels.append(channel)
+        self._msg_senders[conversation_id] = []
+        self._msg_contents[conversation_id] = []
+        return conversation_id
+
+    def _store_message(self, conversation_id, sender, content):
+        self._msg_senders[conversation_id].append(sender)
+        self._msg_contents[conversation_id].append(content)
+
+    def _get_conversation_history(self, conversation_id):
+        senders = self._msg_senders.get(conversation_id, [])
+        contents = self._msg_contents.get(conversation_id, [])
+        return [
+            {'sender': sender, 'content': content, 'timestamp': '2026-02-11'}
+            for sender, content in zip(senders, contents)
+        ]
+
+    # Async shims awaited by the agent
     async def create_conversation(self, customer_id, channel):
         """Create a new conversation record."""
-        conversation_id = f"conv_{len(self.conversations) + 1}"
-        self.conversations[conversation_id] = {
-            'customer_id': customer_id,
-            'channel': channel,
-            'created_at': '2026-02-11'
-        }
-        self.messages[conversation_id] = []
-        return conversation_id
-    
+        return self._create_conversation(customer_id, channel)
+
     async def store_message(self, conversation_id, sender, content):
         """Store a message in the conversation."""
-        message = {
-            'sender': sender,
-            'content': content,
-            'timestamp': '2026-02-11'
-        }
-        self.messages[conversation_id].append(message)
-    
+        self._store_message(conversation_id, sender, content)
+
     async def get_conversation_history(self, conversation_id):
         """Get conversation history."""
-        return self.messages.get(conversation_id, [])
+        return self._get_conversation_history(conversation_id)
+
+    # Dict views used by test assertions
+    @property
+    def conversations(self):
+        return {
+            conv_id: {
+                'customer_id': customer_id,
+                'channel': channel,
+                'created_at': '2026-02-11'
+            }
+            for conv_id, customer_id, channel in zip(
+                self._conv_ids, self._customer_ids, self._channels
+            )
+        }
+
+    @property
+    def messages(self):
+        return {
+            conv_id: self._get_conversation_history(conv_id)
+            for conv_id in self._conv_ids
+        }
 
 
 class TestIntegration:
     """Integration tests for the complete agent flow."""
     
-    def setup_method(self):
-        """Set up test fixtures before each test method."""
-        # Initialize the database mock
+    @pytest.fixture(autouse=True)
+    def mocked_agent(self, monkeypatch):
+        """Build the agent once per test and patch out the model/KB in one place.
+
+        monkeypatch.setattr is cheaper than nested `with patch.object` blocks
+        and is torn down automatically after each test. Tests that need
+        different canned data swap it via self.monkeypatch in the test body.
+        """
         self.db = MockDB()
-        
-        # Initialize the agent with the database mock
         self.agent = CustomerSuccessAgent(db_client=self.db)
-        
-        # Store original methods to restore after test
-        self.original_handle_query = self.agent.handle_query
-        self.original_search_kb = self.agent.search_knowledge_base
-        self.original_format_channel = self.agent.format_for_channel
-        self.original_detect_sentiment = self.agent.detect_sentiment
-        self.original_should_escalate = self.agent.should_escalate
-    
-    def teardown_method(self):
-        """Clean up after each test method."""
-        # Restore original methods
-        self.agent.handle_query = self.original_handle_query
-        self.agent.search_knowledge_base = self.original_search_kb
-        self.agent.format_for_channel = self.original_format_channel
-        self.agent.detect_sentiment = self.original_detect_sentiment
-        self.agent.should_escalate = self.original_should_escalate
-    
+        monkeypatch.setattr(self.agent, 'qwen_client', None)  # No Qwen client in test
+        monkeypatch.setattr(self.agent, 'generate_response', lambda *a, **k: CANNED_RESPONSE)
+        monkeypatch.setattr(self.agent.knowledge_retrieval, 'get_relevant_entries', lambda *a, **k: CANNED_KB)
+        self.monkeypatch = monkeypatch
+
     @pytest.mark.asyncio
     async def test_complete_flow_single_message(self):
         """TEST FLOW 1: Customer sends email: 'How do I add team members to my project?'"""
         customer_id = "test@example.com"
         message = "How do I add team members to my project?"
         channel = "email"
-        
-        # Mock the knowledge base to return a team member answer
-        with patch.object(self.agent.knowledge_retrieval, 'get_relevant_entries', return_value={
-            'results': [{
-                'id': 1,
-                'title': 'Adding Team Members',
-                'content': 'To add team members, go to your project settings and click "Invite Members". Enter their email addresses and select their permission level.',
-                'confidence': 0.9,
-                'source': 'product-docs.md'
-            }],
-            'query_understanding': 'adding team members'
-        }):
-            # Mock the Qwen client to return a specific response
-            with patch.object(self.agent, 'qwen_client', None):  # No Qwen client in test
-                # Mock the generate_response method to return a predictable response
-                with patch.object(self.agent, 'generate_response', 
-                                return_value="To add team members, go to your project settings and click 'Invite Members'. Enter their email addresses and select their permission level."):
-                    
-                    # Run the agent's handle_query method
-                    result = await self.agent.handle_query(message, channel, customer_id)
-        
+
+        # Run the agent's handle_query method (KB/model mocked by mocked_agent)
+        result = await self.agent.handle_query(message, channel, customer_id)
+
         # Verify the response
         assert 'response' in result
         assert 'team members' in result['response'].lower()
@@ -122,6 +162,18 @@ class TestIntegration:
         assert messages[1]['sender'] == 'agent'
         assert 'team members' in messages[1]['content'].lower()
     
+    async def _seed_conversation(self, customer_id, channel, first_customer_msg, first_agent_msg):
+        """Seed MockDB with a completed first interaction, bypassing handle_query.
+
+        The full first-message flow is already covered by
+        test_complete_flow_single_message; seeding directly keeps this
+        test focused on the follow-up behavior.
+        """
+        conv_id = await self.db.create_conversation(customer_id, channel)
+        await self.db.store_message(conv_id, 'customer', first_customer_msg)
+        await self.db.store_message(conv_id, 'agent', first_agent_msg)
+        return conv_id
+
     @pytest.mark.asyncio
     async def test_complete_flow_follow_up_message(self):
         """TEST FLOW 2: Customer sends follow-up: 'Thanks! Is there a limit on team size?'"""
@@ -129,65 +181,18 @@ class TestIntegration:
         first_message = "How do I add team members to my project?"
         follow_up_message = "Thanks! Is there a limit on team size?"
         channel = "email"
-        
-        # First interaction - create conversation and store messages
-        with patch.object(self.agent.knowledge_retrieval, 'get_relevant_entries', return_value={
-            'results': [{
-                'id': 1,
-                'title': 'Adding Team Members',
-                'content': 'To add team members, go to your project settings and click "Invite Members". Enter their email addresses and select their permission level.',
-                'confidence': 0.9,
-                'source': 'product-docs.md'
-            }],
-            'query_understanding': 'adding team members'
-        }):
-            with patch.object(self.agent, 'qwen_client', None):  # No Qwen client in test
-                with patch.object(self.agent, 'generate_response', 
-                                return_value="To add team members, go to your project settings and click 'Invite Members'. Enter their email addresses and select their permission level."):
-                    
-                    # Run the agent's handle_query method for the first message
-                    first_result = await self.agent.handle_query(first_message, channel, customer_id)
-        
-        # Verify first interaction
-        assert 'response' in first_result
-        assert 'team members' in first_result['response'].lower()
-        assert 'dear customer' in first_result['response'].lower()  # Formal email greeting
-        
-        # Verify conversation was stored in DB
-        assert len(self.db.conversations) == 1
-        conv_id = first_result.get('conversation_id')  # Get conversation ID from the result
-        assert conv_id is not None
-        assert self.db.conversations[conv_id]['customer_id'] == customer_id
-        assert self.db.conversations[conv_id]['channel'] == channel
-        
-        # Verify first messages were stored
-        messages = self.db.messages[conv_id]
-        assert len(messages) == 2  # Customer message + Agent response
-        assert messages[0]['sender'] == 'customer'
-        assert messages[0]['content'] == first_message
-        assert messages[1]['sender'] == 'agent'
-        assert 'team members' in messages[1]['content'].lower()
-        
-        # Second interaction - follow-up message using the same conversation ID
-        with patch.object(self.agent.knowledge_retrieval, 'get_relevant_entries', return_value={
-            'results': [{
-                'id': 1,
-                'title': 'Team Size Limits',
-                'content': 'Free accounts have a limit of 5 team members. Pro accounts support up to 25 members, and Enterprise accounts have unlimited members.',
-                'confidence': 0.95,
-                'source': 'product-docs.md'
-            }],
-            'query_understanding': 'team size limits'
-        }):
-            # Mock the Qwen client to return a specific response
-            with patch.object(self.agent, 'qwen_client', None):  # No Qwen client in test
-                # Mock the generate_response method to return a predictable response
-                with patch.object(self.agent, 'generate_response', 
-                                return_value="Free accounts have a limit of 5 team members. Pro accounts support up to 25 members, and Enterprise accounts have unlimited members."):
-                    
-                    # Run the agent's handle_query method for the follow-up using the same conversation ID
-                    follow_up_result = await self.agent.handle_query(follow_up_message, channel, customer_id, conversation_id=conv_id)
-        
+
+        # Seed the first interaction directly instead of re-running handle_query
+        conv_id = await self._seed_conversation(
+            customer_id, channel, first_message,
+            "Dear Customer, to add team members, go to your project settings."
+        )
+
+        # Follow-up interaction - swap in the team-size payload and reuse the conversation ID
+        self.monkeypatch.setattr(self.agent, 'generate_response', lambda *a, **k: FOLLOW_UP_RESPONSE)
+        self.monkeypatch.setattr(self.agent.knowledge_retrieval, 'get_relevant_entries', lambda *a, **k: FOLLOW_UP_KB)
+        follow_up_result = await self.agent.handle_query(follow_up_message, channel, customer_id, conversation_id=conv_id)
+
         # Verify the follow-up response
         assert 'response' in follow_up_result
         assert 'limit' in follow_up_result['response'].lower() or 'members' in follow_up_result['response'].lower()
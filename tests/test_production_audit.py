@@ -322,7 +322,7 @@ class TestKafkaOrchestration:
         assert len(started) == 1, "FTEKafkaConsumer.start() should be called once"
         assert len(consumed) == 1, "consume() should be called once"
         handler_fn, dlq_topic = consumed[0]
-        assert handler_fn == worker.process_message
+        assert handler_fn == worker.dispatch_message
         assert dlq_topic is not None  # DLQ topic should be passed
 
     @pytest.mark.asyncio
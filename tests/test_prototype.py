@@ -3,9 +3,7 @@ Test script for Customer Success Agent Prototype
 Tests all required scenarios and functionality.
 """
 
-import asyncio
 import pytest
-from unittest.mock import Mock, patch, MagicMock
 from agent.agent_prototype import CustomerSuccessAgent
 from agent.skills.knowledge_retrieval import KnowledgeRetrieval
 from agent.skills.sentiment_analysis import SentimentAnalysis
@@ -17,20 +15,26 @@ from agent.skills.customer_identification import CustomerIdentification
 class TestCustomerSuccessAgent:
     """Test class for CustomerSuccessAgent functionality."""
     
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def agent(self):
-        """Create a test agent instance."""
+        """Create a test agent instance, shared across the module.
+
+        The agent holds no per-test mutable state: conversation history is
+        threaded through conversation_id / the DB client rather than stored
+        on self, and the skills only keep bounded memo caches. That makes
+        sharing one instance safe under xdist workers too.
+        """
         # Create an agent without HF token to avoid API dependency in tests
         return CustomerSuccessAgent()
     
-    def test_email_query_password_reset(self, agent):
+    async def test_email_query_password_reset(self, agent, monkeypatch):
         """TEST 1: Email Query (Password Reset)"""
         message = "Hello, I forgot my password and can't log in. Can you help me reset it?"
         channel = "email"
         customer_id = "test@example.com"
-        
-        # Mock the knowledge base to return a password reset answer
-        with patch.object(agent.knowledge_retrieval, 'get_relevant_entries', return_value={
+
+        # Stub the knowledge base to return a password reset answer
+        monkeypatch.setattr(agent.knowledge_retrieval, 'get_relevant_entries', lambda *a, **kw: {
             'results': [{
                 'id': 1,
                 'title': 'Password Reset',
@@ -39,30 +43,25 @@ class TestCustomerSuccessAgent:
                 'source': 'product-docs.md'
             }],
             'query_understanding': 'password reset'
-        }):
-            # Run the async function
-            async def run_test():
-                result = await agent.handle_query(message, channel, customer_id)
-                return result
-            
-            result = asyncio.run(run_test())
-            
-            # Assertions
-            assert 'response' in result
-            assert 'password' in result['response'].lower() or 'reset' in result['response'].lower()
-            assert result['response'].startswith('Dear Customer,')  # Formal email greeting
-            assert 'Best regards' in result['response']  # Formal email closing
-            assert isinstance(result['sentiment'], float)
-            assert isinstance(result['should_escalate'], bool)
-    
-    def test_whatsapp_query_feature(self, agent):
+        })
+        result = await agent.handle_query(message, channel, customer_id)
+
+        # Assertions
+        assert 'response' in result
+        assert 'password' in result['response'].lower() or 'reset' in result['response'].lower()
+        assert result['response'].startswith('Dear Customer,')  # Formal email greeting
+        assert 'Best regards' in result['response']  # Formal email closing
+        assert isinstance(result['sentiment'], float)
+        assert isinstance(result['should_escalate'], bool)
+
+    async def test_whatsapp_query_feature(self, agent, monkeypatch):
         """TEST 2: WhatsApp Query (Feature Question)"""
         message = "hey does your app work on mobile?"
         channel = "whatsapp"
         customer_id = "test@example.com"
-        
-        # Mock the knowledge base to return a mobile compatibility answer
-        with patch.object(agent.knowledge_retrieval, 'get_relevant_entries', return_value={
+
+        # Stub the knowledge base to return a mobile compatibility answer
+        monkeypatch.setattr(agent.knowledge_retrieval, 'get_relevant_entries', lambda *a, **kw: {
             'results': [{
                 'id': 1,
                 'title': 'Mobile Compatibility',
@@ -71,33 +70,23 @@ class TestCustomerSuccessAgent:
                 'source': 'product-docs.md'
             }],
             'query_understanding': 'mobile compatibility'
-        }):
-            # Run the async function
-            async def run_test():
-                result = await agent.handle_query(message, channel, customer_id)
-                return result
-            
-            result = asyncio.run(run_test())
-            
-            # Assertions
-            assert 'response' in result
-            assert len(result['response']) <= 300  # Under 300 chars for WhatsApp
-            assert 'hey' in result['response'].lower() or 'hi' in result['response'].lower()  # Casual greeting
-            assert isinstance(result['sentiment'], float)
-            assert isinstance(result['should_escalate'], bool)
+        })
+        result = await agent.handle_query(message, channel, customer_id)
+
+        # Assertions
+        assert 'response' in result
+        assert len(result['response']) <= 300  # Under 300 chars for WhatsApp
+        assert 'hey' in result['response'].lower() or 'hi' in result['response'].lower()  # Casual greeting
+        assert isinstance(result['sentiment'], float)
+        assert isinstance(result['should_escalate'], bool)
     
-    def test_pricing_escalation(self, agent):
+    async def test_pricing_escalation(self, agent):
         """TEST 3: Pricing Escalation"""
         message = "How much does the enterprise plan cost?"
         channel = "email"
         customer_id = "test@example.com"
         
-        # Run the async function
-        async def run_test():
-            result = await agent.handle_query(message, channel, customer_id)
-            return result
-        
-        result = asyncio.run(run_test())
+        result = await agent.handle_query(message, channel, customer_id)
         
         # Assertions
         assert 'should_escalate' in result
@@ -108,18 +97,13 @@ class TestCustomerSuccessAgent:
         assert any(term in result['escalation_reason'].lower() for term in pricing_terms), \
                f"Expected pricing-related term in escalation reason, got: {result['escalation_reason']}"
     
-    def test_angry_customer_escalation(self, agent):
+    async def test_angry_customer_escalation(self, agent):
         """TEST 4: Angry Customer"""
         message = "This is TERRIBLE! Your app keeps crashing! I want a REFUND!"
         channel = "whatsapp"
         customer_id = "test@example.com"
         
-        # Run the async function
-        async def run_test():
-            result = await agent.handle_query(message, channel, customer_id)
-            return result
-        
-        result = asyncio.run(run_test())
+        result = await agent.handle_query(message, channel, customer_id)
         
         # Assertions
         assert 'sentiment' in result
@@ -181,11 +165,31 @@ class TestCustomerSuccessAgent:
 
 class TestIndividualSkills:
     """Test individual skill implementations."""
-    
-    def test_knowledge_retrieval(self):
+
+    # Module-scoped skill instances: construction (KB load, word lists,
+    # YAML configs) happens once instead of once per test.
+    @pytest.fixture(scope="module")
+    def kr(self):
+        return KnowledgeRetrieval()
+
+    @pytest.fixture(scope="module")
+    def sa(self):
+        return SentimentAnalysis()
+
+    @pytest.fixture(scope="module")
+    def ed(self):
+        return EscalationDecision()
+
+    @pytest.fixture(scope="module")
+    def ca(self):
+        return ChannelAdaptation()
+
+    @pytest.fixture(scope="module")
+    def ci(self):
+        return CustomerIdentification()
+
+    def test_knowledge_retrieval(self, kr):
         """Test knowledge retrieval skill."""
-        kr = KnowledgeRetrieval()
-        
         # Test with a simple query
         results = kr.get_relevant_entries("password reset", max_results=2)
         
@@ -194,29 +198,25 @@ class TestIndividualSkills:
         assert isinstance(results['results'], list)
         assert len(results['results']) <= 2
     
-    def test_sentiment_analysis(self):
+    @pytest.mark.parametrize("message, expected_sign, expected_labels", [
+        ("Thank you, this is great!", 1, {'positive', 'neutral'}),
+        ("This is terrible and I'm angry!", -1, {'negative', 'angry'}),
+        ("The sky is blue.", 0, {'neutral'}),
+    ], ids=["positive", "negative", "neutral"])
+    def test_sentiment_analysis(self, sa, message, expected_sign, expected_labels):
         """Test sentiment analysis skill."""
-        sa = SentimentAnalysis()
-        
-        # Test positive sentiment
-        pos_result = sa.detect_sentiment("Thank you, this is great!")
-        assert pos_result['sentiment_score'] > 0
-        assert pos_result['sentiment_label'] in ['positive', 'neutral']
-        
-        # Test negative sentiment
-        neg_result = sa.detect_sentiment("This is terrible and I'm angry!")
-        assert neg_result['sentiment_score'] < 0
-        assert neg_result['sentiment_label'] in ['negative', 'angry']
-        
-        # Test neutral sentiment
-        neu_result = sa.detect_sentiment("The sky is blue.")
-        assert -0.1 <= neu_result['sentiment_score'] <= 0.1
-        assert neu_result['sentiment_label'] == 'neutral'
+        result = sa.detect_sentiment(message)
+
+        if expected_sign > 0:
+            assert result['sentiment_score'] > 0
+        elif expected_sign < 0:
+            assert result['sentiment_score'] < 0
+        else:
+            assert -0.1 <= result['sentiment_score'] <= 0.1
+        assert result['sentiment_label'] in expected_labels
     
-    def test_escalation_decision(self):
+    def test_escalation_decision(self, ed):
         """Test escalation decision skill."""
-        ed = EscalationDecision()
-        
         # Test pricing escalation
         escalation_result = ed.should_escalate(
             customer_message="How much does the enterprise plan cost?",
@@ -245,10 +245,8 @@ class TestIndividualSkills:
         assert escalation_result_neg['should_escalate'] is True
         assert any('negative_sentiment' in reason for reason in escalation_result_neg['reasons'])
     
-    def test_channel_adaptation(self):
+    def test_channel_adaptation(self, ca):
         """Test channel adaptation skill."""
-        ca = ChannelAdaptation()
-        
         # Test email formatting
         email_response = ca.adapt_response(
             original_response="Thank you for contacting us.",
@@ -267,10 +265,8 @@ class TestIndividualSkills:
         assert whatsapp_response['tone_level'] == 'casual'
         assert 'Hey there!' in whatsapp_response['adapted_response']
     
-    def test_customer_identification(self):
+    def test_customer_identification(self, ci):
         """Test customer identification skill."""
-        ci = CustomerIdentification()
-        
         # Test known customer
         known_result = ci.identify_customer(identifier='john.doe@example.com')
         assert known_result['customer_type'] in ['new', 'returning', 'vip']
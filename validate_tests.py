@@ -6,42 +6,91 @@ This script validates that all test files are properly structured and can be imp
 
 import os
 import sys
-import importlib.util
+import importlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 
+def _validate_one(path):
+    """Import a single test file; return (name, error message or None)."""
+    test_file = Path(path)
+    # Go through the standard import system rather than
+    # spec_from_file_location so the __pycache__ .pyc fast path applies
+    # and repeat runs skip recompiling the source.
+    test_dir = str(test_file.parent)
+    if test_dir not in sys.path:
+        sys.path.insert(0, test_dir)
+    try:
+        importlib.import_module(test_file.stem)
+        return (test_file.name, None)
+    except ImportError as e:
+        return (test_file.name, f"Import Error: {e}")
+    except SyntaxError as e:
+        return (test_file.name, f"Syntax Error: {e}")
+    except Exception as e:
+        return (test_file.name, f"Error: {e}")
+
 def validate_test_files():
     """Validate that all test files can be imported without errors."""
     test_dir = Path("tests")
-    test_files = list(test_dir.glob("test_*.py"))
-    
+    test_files = sorted(test_dir.glob("test_*.py"))
+
     print(f"Validating {len(test_files)} test files...")
-    
+
+    # Each file's import chain (pytest, asyncpg, agent modules) is
+    # CPU-bound and independent, so fan the imports out across processes
+    # and report in order afterward.
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(_validate_one, [str(p) for p in test_files]))
+
     all_valid = True
-    
-    for test_file in test_files:
-        print(f"\nValidating: {test_file.name}")
-        try:
-            # Import the module
-            spec = importlib.util.spec_from_file_location(test_file.stem, test_file)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            print(f"  ✓ {test_file.name} - Valid")
-        except ImportError as e:
-            print(f"  ✗ {test_file.name} - Import Error: {e}")
-            all_valid = False
-        except SyntaxError as e:
-            print(f"  ✗ {test_file.name} - Syntax Error: {e}")
+
+    for name, error in results:
+        print(f"\nValidating: {name}")
+        if error is None:
+            print(f"  ✓ {name} - Valid")
+        else:
+            print(f"  ✗ {name} - {error}")
             all_valid = False
-        except Exception as e:
-            print(f"  ✗ {test_file.name} - Error: {e}")
+
+    return all_valid
+
+def _try_import(component):
+    """Import one (module_path, class_name) pair; return it plus an error or None."""
+    module_path, class_name = component
+    try:
+        module = importlib.import_module(module_path)
+        getattr(module, class_name)
+        return (module_path, class_name, None)
+    except ImportError as e:
+        return (module_path, class_name, f"Import Error: {e}")
+    except AttributeError as e:
+        return (module_path, class_name, f"Attribute Error: {e}")
+    except Exception as e:
+        return (module_path, class_name, f"Error: {e}")
+
+def _validate_components(components):
+    """Import components concurrently, then report results in order.
+
+    Module imports release the GIL on the I/O-heavy parts (reading
+    bytecode, shared libraries), so threads overlap them nicely and the
+    interpreter's import lock keeps concurrent imports safe.
+    """
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(_try_import, components))
+
+    all_valid = True
+    for module_path, class_name, error in results:
+        if error is None:
+            print(f"  ✓ {module_path}.{class_name} - Available")
+        else:
+            print(f"  ✗ {module_path}.{class_name} - {error}")
             all_valid = False
-    
     return all_valid
 
 def validate_agent_components():
     """Validate that agent components can be imported."""
     print("\nValidating agent components...")
-    
+
     components = [
         ("agent.agent_prototype", "CustomerSuccessAgent"),
         ("agent.skills.knowledge_retrieval", "KnowledgeRetrieval"),
@@ -50,54 +99,20 @@ def validate_agent_components():
         ("agent.skills.channel_adaptation", "ChannelAdaptation"),
         ("agent.skills.customer_identification", "CustomerIdentification"),
     ]
-    
-    all_valid = True
-    
-    for module_path, class_name in components:
-        try:
-            module = importlib.import_module(module_path)
-            cls = getattr(module, class_name)
-            print(f"  ✓ {module_path}.{class_name} - Available")
-        except ImportError as e:
-            print(f"  ✗ {module_path}.{class_name} - Import Error: {e}")
-            all_valid = False
-        except AttributeError as e:
-            print(f"  ✗ {module_path}.{class_name} - Attribute Error: {e}")
-            all_valid = False
-        except Exception as e:
-            print(f"  ✗ {module_path}.{class_name} - Error: {e}")
-            all_valid = False
-    
-    return all_valid
+
+    return _validate_components(components)
 
 def validate_channel_components():
     """Validate that channel components can be imported."""
     print("\nValidating channel components...")
-    
+
     components = [
         ("channels.gmail_handler", "GmailHandler"),
         ("channels.whatsapp_handler", "WhatsAppHandler"),
         ("channels.web_form_handler", "WebFormHandler"),
     ]
-    
-    all_valid = True
-    
-    for module_path, class_name in components:
-        try:
-            module = importlib.import_module(module_path)
-            cls = getattr(module, class_name)
-            print(f"  ✓ {module_path}.{class_name} - Available")
-        except ImportError as e:
-            print(f"  ✗ {module_path}.{class_name} - Import Error: {e}")
-            all_valid = False
-        except AttributeError as e:
-            print(f"  ✗ {module_path}.{class_name} - Attribute Error: {e}")
-            all_valid = False
-        except Exception as e:
-            print(f"  ✗ {module_path}.{class_name} - Error: {e}")
-            all_valid = False
-    
-    return all_valid
+
+    return _validate_components(components)
 
 def validate_worker_components():
     """Validate that worker components can be imported."""